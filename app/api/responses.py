@@ -0,0 +1,20 @@
+"""Clases de respuesta HTTP de la API OCR."""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:  # Opcional: serialización JSON en C, escribiendo UTF-8 directamente
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` que serializa con orjson si está instalado y con ``json`` estándar si no."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -1,10 +1,14 @@
 """Definición de rutas REST para la API OCR."""
 from __future__ import annotations
 
+import asyncio
 import importlib.util
+import logging
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import AsyncIterator
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.concurrency import run_in_threadpool
@@ -12,7 +16,9 @@ from pydantic import BaseModel, Field
 
 from app.core.config import Settings
 from app.services.file_utils import validate_image_path
-from app.services.image_preprocess import preprocess_image
+from app.services.image_io import load_image
+from app.services.image_preprocess import file_cache_key, preprocess_cache_lookup, preprocess_image
+from app.services.ocr_pipeline import run_pipeline
 
 router = APIRouter()
 
@@ -30,7 +36,7 @@ async def health_check(request: Request) -> dict:
     logger = request.app.state.logger.getChild("health")
 
     response = {
-        "status": "healthy" if request.app.state.ocr_engine.is_ready() else "initializing",
+        "status": "healthy" if await _engine_ready(request) else "initializing",
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": settings.api_version,
     }
@@ -44,6 +50,17 @@ async def health_check(request: Request) -> dict:
     return response
 
 
+@router.get("/cache/stats")
+async def cache_stats(request: Request) -> dict:
+    """Estadísticas de la cache de resultados OCR del motor en uso (local o worker compartido)."""
+    try:
+        # Con el worker compartido es una llamada de red: fuera del event loop
+        return await run_in_threadpool(request.app.state.ocr_engine.cache_stats)
+    except (OSError, EOFError) as error:
+        request.app.state.logger.warning("No se pudieron obtener las estadísticas de cache: %s", error)
+        raise HTTPException(status_code=503, detail="Worker OCR no disponible.") from error
+
+
 @router.post("/ocr")
 async def perform_ocr(payload: OCRRequest, request: Request) -> dict:
     """Procesa una imagen utilizando el motor OCR configurado."""
@@ -59,11 +76,69 @@ async def perform_ocr(payload: OCRRequest, request: Request) -> dict:
     logger.info("Solicitud OCR recibida para %s", image_path)
 
     start_time = time.perf_counter()
-    async with request.app.state.semaphore:
+    # Peticiones simultáneas sobre el mismo archivo sin cambios comparten una única ejecución
+    key = file_cache_key(image_path)
+    text = await request.app.state.inflight.run(
+        key, lambda: run_ocr_pipeline(request, settings, logger, image_path, key)
+    )
+
+    elapsed = time.perf_counter() - start_time
+    logger.info("OCR completado para %s en %.2f segundos", image_path, elapsed)
+    return {"text": text, "elapsed_seconds": round(elapsed, 3)}
+
+
+async def run_ocr_pipeline(
+    request: Request,
+    settings: Settings,
+    logger: logging.Logger,
+    image_path: Path,
+    file_key: tuple[str, int, int],
+) -> str:
+    """Preprocesa la imagen y ejecuta OCR respetando la admisión y los semáforos por etapa.
+
+    ``file_key`` es el (ruta, mtime, tamaño) tomado antes de empezar la lectura: la cache
+    de preprocesado usa esa clave y no una posterior, para no asociar píxeles antiguos
+    a un archivo sobrescrito durante la espera.
+    """
+    cpu_pool = request.app.state.cpu_pool
+    # Con el preprocesado en cache no hace falta leer ni decodificar el archivo
+    processed_image = None if cpu_pool is not None else preprocess_cache_lookup(image_path, settings, file_key)
+    read_task = None
+    async with ocr_slot(request, settings, logger):
         preprocess_logger = logger.getChild("preprocess")
+        if cpu_pool is None and processed_image is None:
+            # Solo tras la admisión, para que las peticiones en cola no retengan imágenes
+            # decodificadas; la lectura se solapa con la espera del semáforo de preprocesado
+            read_task = asyncio.create_task(load_image(image_path))
         try:
-            processed_image = await run_in_threadpool(preprocess_image, image_path, settings, preprocess_logger)
-            text = await run_in_threadpool(request.app.state.ocr_engine.recognize_text, processed_image)
+            if cpu_pool is not None:
+                async with request.app.state.ocr_semaphore:
+                    loop = asyncio.get_running_loop()
+                    text = await loop.run_in_executor(cpu_pool, run_pipeline, image_path)
+            else:
+                # Dos etapas con semáforos propios: el preprocesado de una petición
+                # se solapa con el OCR de otra
+                if processed_image is None:
+                    async with request.app.state.preprocess_semaphore:
+                        image = await read_task
+                        if image is None:
+                            # Archivo no decodificable: no se vuelve a leer del disco
+                            raise ValueError(f"No se pudo cargar la imagen {image_path}.")
+                        processed_image = await run_in_threadpool(
+                            preprocess_image, image_path, settings, preprocess_logger, image, file_key
+                        )
+                        del image
+                else:
+                    preprocess_logger.debug("Preprocesado reutilizado desde cache para %s", image_path)
+                if request.app.state.ocr_batcher is not None:
+                    # El batcher limita por sí mismo los lotes en paralelo
+                    text = await request.app.state.ocr_batcher.submit(processed_image)
+                else:
+                    async with request.app.state.ocr_semaphore:
+                        loop = asyncio.get_running_loop()
+                        text = await loop.run_in_executor(
+                            request.app.state.ocr_executor, request.app.state.ocr_engine.recognize_text, processed_image
+                        )
         except ModuleNotFoundError as e:
             if getattr(e, "name", "") == "paddle":
                 logger.error(
@@ -82,13 +157,59 @@ async def perform_ocr(payload: OCRRequest, request: Request) -> dict:
             logger.exception("Error procesando OCR para %s", image_path)
             raise HTTPException(status_code=500, detail="Error interno procesando la imagen.") from error
         finally:
+            if read_task is not None and not read_task.done():
+                read_task.cancel()
             # Libera memoria referencial explícitamente
             if "processed_image" in locals():
                 del processed_image
+            if "image" in locals():
+                del image
+
+    return text
+
+
+@asynccontextmanager
+async def ocr_slot(
+    request: Request,
+    settings: Settings,
+    logger: logging.Logger,
+) -> AsyncIterator[None]:
+    """Reserva un hueco del semáforo OCR o responde 503 si el servicio está saturado.
+
+    Rechaza de inmediato cuando ya hay ``ocr_max_queue`` peticiones esperando y
+    limita la espera a ``ocr_queue_timeout_s`` segundos.
+    """
+    state = request.app.state
+    semaphore: asyncio.Semaphore = state.semaphore
+    if not semaphore.locked():
+        # Hay hueco libre: se adquiere sin ceder el control al event loop
+        await semaphore.acquire()
+    else:
+        if state.ocr_waiting >= settings.ocr_max_queue:
+            logger.warning("Cola OCR llena (%d en espera). Petición rechazada.", state.ocr_waiting)
+            raise HTTPException(status_code=503, detail="Servicio OCR saturado, reintente más tarde.")
+
+        state.ocr_waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=settings.ocr_queue_timeout_s)
+        except asyncio.TimeoutError as error:
+            logger.warning("Tiempo de espera en cola OCR agotado (%.1f s).", settings.ocr_queue_timeout_s)
+            raise HTTPException(status_code=503, detail="Servicio OCR saturado, reintente más tarde.") from error
+        finally:
+            state.ocr_waiting -= 1
 
-    elapsed = time.perf_counter() - start_time
-    logger.info("OCR completado para %s en %.2f segundos", image_path, elapsed)
-    return {"text": text, "elapsed_seconds": round(elapsed, 3)}
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+async def _engine_ready(request: Request) -> bool:
+    """Indica si hay un motor OCR disponible (en proceso, en el pool de procesos o en el worker compartido)."""
+    if request.app.state.cpu_pool is not None:
+        return True
+    # is_ready del worker compartido hace E/S de red: no debe bloquear el event loop
+    return await run_in_threadpool(request.app.state.ocr_engine.is_ready)
 
 
 def gather_resource_metrics() -> dict:
@@ -1,7 +1,8 @@
 """Configuración central de la aplicación OCR."""
-from functools import lru_cache
+import os
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,6 +16,16 @@ class Settings(BaseSettings):
     app_name: str = "OCR API"
     api_version: str = "1.0.0"
     max_concurrent_requests: int = Field(3, ge=1, description="Número máximo de OCR simultáneos.")
+    ocr_max_queue: int = Field(
+        16,
+        ge=0,
+        description="Peticiones OCR que pueden esperar turno; por encima se responde 503 de inmediato.",
+    )
+    ocr_queue_timeout_s: float = Field(
+        30.0,
+        gt=0.0,
+        description="Segundos máximos de espera por un turno OCR antes de responder 503.",
+    )
     max_image_size_mb: int = Field(10, ge=1, description="Tamaño máximo permitido por imagen en MB.")
     max_image_dimension: int = Field(
         2500,
@@ -33,6 +44,13 @@ class Settings(BaseSettings):
         True,
         description="Indica si el endpoint de salud debe incluir métricas de CPU/RAM.",
     )
+    denoise_algorithm: Literal["nlm", "bilateral", "median"] = Field(
+        "bilateral",
+        description=(
+            "Algoritmo de reducción de ruido: 'bilateral' o 'median' (rápidos) o 'nlm' "
+            "(fastNlMeansDenoising, máxima calidad pero mucho más lento)."
+        ),
+    )
     denoise_h: float = Field(10.0, ge=0.0, description="Parámetro h para fastNlMeansDenoising.")
     denoise_template_window_size: int = Field(7, ge=1, description="Tamaño de ventana de plantilla para denoising.")
     denoise_search_window_size: int = Field(21, ge=1, description="Tamaño de ventana de búsqueda para denoising.")
@@ -61,13 +79,158 @@ class Settings(BaseSettings):
             "100% procesa toda la imagen. Mínimo permitido 50%."
         ),
     )
-    preprocess_enable_denoise: bool = Field(False, description="Aplica denoise (desactivar en documentos claros).")
-    preprocess_enable_binarize: bool = Field(False, description="Aplica binarización adaptativa (desactivado por defecto).")
-    preprocess_max_deskew_degrees: float = Field(15.0, ge=0.0, le=45.0, description="Umbral máximo de corrección de inclinación en grados.")
+    preprocess_cache_size: int = Field(
+        32,
+        ge=0,
+        description="Cantidad de imágenes preprocesadas a mantener en cache LRU (0 desactiva la cache).",
+    )
+    ocr_use_process_pool: bool = Field(
+        False,
+        description=(
+            "Ejecuta preprocesado y OCR en un pool de procesos (uno por petición concurrente) en lugar de hilos. "
+            "Evita la contención del GIL a costa de cargar un modelo por proceso y de una cache de preprocesado por proceso."
+        ),
+    )
+    ocr_pool_size: int = Field(
+        0,
+        ge=0,
+        description=(
+            "Instancias de PaddleOCR en el pool del motor. 0 = automático: "
+            "min(MAX_CONCURRENT_REQUESTS, núcleos de CPU). En GPU cada instancia ocupa VRAM propia."
+        ),
+    )
+    ocr_batch_max_size: int = Field(
+        1,
+        ge=1,
+        description=(
+            "Máximo de imágenes por lote enviado a PaddleOCR. 1 desactiva el agrupamiento; "
+            "valores mayores aprovechan mejor la GPU cuando hay peticiones concurrentes."
+        ),
+    )
+    ocr_batch_max_wait_ms: float = Field(
+        10.0,
+        ge=0.0,
+        description="Milisegundos máximos que una imagen espera a completar su lote antes de despacharlo.",
+    )
+    ocr_max_side: int = Field(
+        0,
+        ge=0,
+        description=(
+            "Lado mayor máximo de la imagen enviada al detector OCR; se reduce con INTER_AREA (0 sin límite). "
+            "Solo tiene efecto por debajo de MAX_IMAGE_DIMENSION, que el preprocesado ya aplica."
+        ),
+    )
+    ocr_blank_std_threshold: float = Field(
+        2.0,
+        ge=0.0,
+        description=(
+            "Desviación típica de píxeles por debajo de la cual la imagen se considera en blanco y se devuelve "
+            "texto vacío sin ejecutar OCR (0 desactiva la comprobación; útil con documentos de muy bajo contraste)."
+        ),
+    )
+    ocr_cache_entries: int = Field(
+        128,
+        ge=0,
+        description="Textos OCR mantenidos en cache LRU por contenido de la imagen (0 desactiva la cache).",
+    )
+    ocr_warmup: bool = Field(
+        True,
+        description=(
+            "Crea y precalienta todas las instancias de PaddleOCR en el arranque para que la primera "
+            "petición no pague la construcción del modelo. Alarga el arranque varios segundos por instancia."
+        ),
+    )
+    ocr_worker_address: str | None = Field(
+        None,
+        description=(
+            "Dirección del worker OCR compartido ('host:puerto' o ruta de socket Unix). Si se define, la API "
+            "envía las imágenes a ese proceso en lugar de cargar su propio modelo."
+        ),
+    )
+    ocr_worker_authkey: str | None = Field(
+        None,
+        description=(
+            "Clave secreta compartida que autentica las conexiones con el worker OCR. Obligatoria si se define "
+            "OCR_WORKER_ADDRESS: el worker deserializa (pickle) lo que recibe de clientes autenticados."
+        ),
+    )
+    ocr_worker_probe_timeout_s: float = Field(
+        5.0,
+        gt=0,
+        description=(
+            "Tiempo máximo (s) de las consultas de estado al worker OCR compartido (/health, /cache/stats); "
+            "si se agota el worker se considera no disponible."
+        ),
+    )
     ocr_language: str = Field("es", description="Código de idioma para el motor OCR.")
     ocr_use_gpu: bool = Field(False, description="Indica si se debe utilizar GPU para PaddleOCR.")
     ocr_enable_mkldnn: bool = Field(True, description="Habilita MKLDNN para acelerar inferencia en CPU.")
     ocr_angle_classifier: bool = Field(True, description="Activa el clasificador de ángulo en PaddleOCR.")
+    ocr_enable_hpi: bool = Field(
+        True,
+        description=(
+            "Activa la inferencia de alto rendimiento de PaddleOCR 3.x (selección automática de "
+            "Paddle Inference/OpenVINO/ONNX Runtime/TensorRT). Si faltan sus dependencias se usa la inferencia estándar."
+        ),
+    )
+    ocr_precision: Literal["fp32", "fp16"] = Field(
+        "fp32",
+        description=(
+            "Precisión de inferencia. 'fp16' solo se aplica en GPU y activa TensorRT (requiere "
+            "paddlepaddle-gpu compilado con TensorRT)."
+        ),
+    )
+    ocr_rec_batch_num: int = Field(
+        32,
+        ge=1,
+        description=(
+            "Líneas de texto que el reconocedor procesa por lote. Valores altos aprovechan mejor la GPU "
+            "en páginas densas, pero aumentan la VRAM por instancia y pueden provocar errores de memoria de CUDA."
+        ),
+    )
+    ocr_det_limit_side_len: int | None = Field(
+        None,
+        ge=32,
+        description=(
+            "Límite (px) con el que el detector reescala internamente la imagen; se interpreta según "
+            "OCR_DET_LIMIT_TYPE. Sin definir se mantiene el valor por defecto de PaddleOCR."
+        ),
+    )
+    ocr_det_limit_type: Literal["min", "max"] | None = Field(
+        None,
+        description=(
+            "'max' acota el lado mayor a OCR_DET_LIMIT_SIDE_LEN (más rápido, puede perder texto pequeño); "
+            "'min' garantiza ese lado menor. Sin definir se mantiene el valor por defecto de PaddleOCR."
+        ),
+    )
+    ocr_det_model_name: str | None = Field(
+        None,
+        description=(
+            "Modelo de detección de PaddleOCR 3.x (p. ej. PP-OCRv5_mobile_det). Sin definir se usa el "
+            "del idioma configurado."
+        ),
+    )
+    ocr_det_model_dir: str | None = Field(
+        None,
+        description=(
+            "Directorio de un modelo de detección exportado para PaddleOCR 3.x (con inference.yml). "
+            "Debe corresponder a OCR_DET_MODEL_NAME o, si no se define, al modelo del idioma."
+        ),
+    )
+    ocr_rec_model_name: str | None = Field(
+        None,
+        description=(
+            "Modelo de reconocimiento de PaddleOCR 3.x (p. ej. latin_PP-OCRv5_mobile_rec). Sin definir "
+            "se usa el del idioma configurado."
+        ),
+    )
+    ocr_rec_model_dir: str | None = Field(
+        None,
+        description=(
+            "Directorio de un modelo de reconocimiento exportado para PaddleOCR 3.x (con inference.yml). "
+            "Debe corresponder a OCR_REC_MODEL_NAME o, si no se define, al modelo del idioma."
+        ),
+    )
 
     @field_validator("allowed_image_dirs", mode="before")
     @classmethod
@@ -81,23 +244,62 @@ class Settings(BaseSettings):
             return [item for item in value if isinstance(item, str) and item.strip()]
         raise TypeError("allowed_image_dirs debe ser una cadena o una colección de cadenas")
 
-    @property
+    @cached_property
     def max_image_size_bytes(self) -> int:
         """Devuelve el tamaño máximo permitido de la imagen en bytes."""
         return self.max_image_size_mb * 1024 * 1024
 
-    @property
+    @cached_property
     def log_path(self) -> Path:
         """Obtiene la ruta completa del archivo de log principal."""
         return Path(self.log_dir).expanduser() / self.log_filename
 
-    @property
-    def allowed_image_paths(self) -> list[Path]:
-        """Lista de rutas base permitidas para las imágenes."""
-        return [Path(path).expanduser().resolve() for path in self.allowed_image_dirs]
+    @cached_property
+    def native_threads_per_worker(self) -> int:
+        """Hilos nativos (OpenCV, OpenMP/MKL, Paddle) por etapa concurrente para no sobresuscribir la CPU.
+
+        En modo hilos se ejecutan a la vez hasta N preprocesados y N OCR (2N etapas);
+        en el pool de procesos cada uno de los N procesos ejecuta ambas en serie.
+        """
+        stages = self.max_concurrent_requests if self.ocr_use_process_pool else 2 * self.max_concurrent_requests
+        return max(1, (os.cpu_count() or 1) // stages)
+
+    @cached_property
+    def effective_ocr_pool_size(self) -> int:
+        """Tamaño del pool de PaddleOCR, resolviendo el valor automático (0)."""
+        if self.ocr_pool_size > 0:
+            return self.ocr_pool_size
+        return max(1, min(self.max_concurrent_requests, os.cpu_count() or 1))
+
+    @cached_property
+    def allowed_image_paths(self) -> tuple[Path, ...]:
+        """Rutas base permitidas para las imágenes, resueltas una única vez."""
+        return tuple(Path(path).expanduser().resolve() for path in self.allowed_image_dirs)
+
+    @cached_property
+    def allowed_image_path_strs(self) -> tuple[str, ...]:
+        """Rutas base permitidas normalizadas (``normcase``) y terminadas en separador."""
+        bases = []
+        for path in self.allowed_image_paths:
+            base = os.path.normcase(str(path))
+            if not base.endswith(os.sep):
+                base += os.sep
+            bases.append(base)
+        return tuple(bases)
+
+
+_settings: Settings | None = None
 
 
-@lru_cache()
 def get_settings() -> Settings:
-    """Obtiene una instancia cacheada de la configuración."""
-    return Settings()
+    """Obtiene una instancia cacheada de la configuración.
+
+    Usa un singleton a nivel de módulo en lugar de ``lru_cache`` para no tomar
+    un lock en cada llamada; una carrera en el primer acceso solo construiría
+    una instancia equivalente de más.
+    """
+    global _settings
+    settings = _settings
+    if settings is None:
+        settings = _settings = Settings()
+    return settings
@@ -2,14 +2,26 @@
 from __future__ import annotations
 
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import multiprocessing
+import queue
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
 
 from .config import Settings
 
+# Hilo de fondo que escribe en consola/archivo los registros encolados
+_queue_listener: QueueListener | None = None
+# Hilo que recoge los registros enviados por los procesos de trabajo del pool
+_worker_listener: QueueListener | None = None
+
 
 def configure_logging(settings: Settings) -> logging.Logger:
-    """Configura el logger principal de la aplicación."""
+    """Configura el logger principal de la aplicación.
+
+    Los hilos de las peticiones solo encolan los registros; la escritura en
+    consola y archivo la realiza un ``QueueListener`` en segundo plano.
+    """
+    global _queue_listener
     log_path: Path = settings.log_path
     log_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -35,11 +47,61 @@ def configure_logging(settings: Settings) -> logging.Logger:
     file_handler.setFormatter(formatter)
 
     # Evita agregar handlers duplicados en reinicios/calientes
+    shutdown_logging()
     logger.handlers.clear()
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _queue_listener.start()
 
     logging.getLogger("uvicorn").handlers.clear()
     logging.getLogger("uvicorn.access").handlers.clear()
 
     return logger
+
+
+def start_worker_log_listener() -> multiprocessing.Queue:
+    """Crea la cola por la que los procesos de trabajo envían sus registros al proceso principal.
+
+    Los registros recibidos se escriben con los mismos handlers de consola y
+    archivo que el logger principal. Debe llamarse después de :func:`configure_logging`.
+    """
+    global _worker_listener
+    assert _queue_listener is not None, "configure_logging debe llamarse antes"
+    log_queue: multiprocessing.Queue = multiprocessing.Queue()
+    _worker_listener = QueueListener(log_queue, *_queue_listener.handlers, respect_handler_level=True)
+    _worker_listener.start()
+    return log_queue
+
+
+def configure_worker_logging(settings: Settings, log_queue: multiprocessing.Queue) -> logging.Logger:
+    """Configura el logger en un proceso de trabajo para enviar los registros al proceso principal.
+
+    Con ``fork`` el proceso hereda el ``QueueHandler`` del principal pero no el hilo
+    del ``QueueListener``, así que sus registros se acumularían en una cola que
+    nadie lee; se sustituye por uno que escribe en ``log_queue``.
+    """
+    global _queue_listener, _worker_listener
+    # Copias heredadas de los listeners del proceso principal: sus hilos no existen aquí
+    _queue_listener = None
+    _worker_listener = None
+
+    logger = logging.getLogger(settings.app_name.replace(" ", "_"))
+    logger.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
+    logger.propagate = False
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(log_queue))
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Detiene los listeners de logging vaciando los registros pendientes."""
+    global _queue_listener, _worker_listener
+    if _worker_listener is not None:
+        _worker_listener.stop()
+        _worker_listener = None
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
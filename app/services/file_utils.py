@@ -1,6 +1,7 @@
 """Utilidades para validación de rutas y archivos de imagen."""
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from app.core.config import Settings
@@ -21,17 +22,18 @@ def validate_image_path(image_path: Path, settings: Settings) -> Path:
             f"{settings.max_image_size_mb} MB."
         )
 
-    allowed_roots = settings.allowed_image_paths
-    if allowed_roots and not any(is_subpath(resolved_path, base) for base in allowed_roots):
+    allowed_roots = settings.allowed_image_path_strs
+    if allowed_roots and not is_subpath(resolved_path, allowed_roots):
         raise ValueError("La imagen solicitada se encuentra fuera de los directorios permitidos.")
 
     return resolved_path
 
 
-def is_subpath(path: Path, base: Path) -> bool:
-    """Indica si una ruta se encuentra dentro de otra ruta base."""
-    try:
-        path.relative_to(base)
-    except ValueError:
-        return False
-    return True
+def is_subpath(path: Path, bases: tuple[str, ...]) -> bool:
+    """Indica si una ruta se encuentra dentro de alguna de las rutas base.
+
+    Las bases deben venir normalizadas con ``os.path.normcase`` y terminar en
+    separador (ver ``Settings.allowed_image_path_strs``).
+    """
+    path_str = os.path.normcase(str(path))
+    return any(path_str.startswith(base) or path_str == base[:-1] for base in bases)
@@ -0,0 +1,30 @@
+"""Lectura y decodificación de imágenes sin bloquear el event loop."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+def decode_image(data: bytes | bytearray | memoryview) -> np.ndarray | None:
+    """Decodifica bytes de imagen como BGR sin copiarlos (None si no son decodificables)."""
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def read_image(image_path: Path) -> np.ndarray | None:
+    """Lee el archivo y lo decodifica como imagen BGR (None si no es decodificable)."""
+    return cv2.imdecode(np.fromfile(str(image_path), dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+async def load_image(source: Path | bytes | bytearray | memoryview) -> np.ndarray | None:
+    """Obtiene la imagen de una ruta o de sus bytes en memoria.
+
+    La lectura del disco y la decodificación se ejecutan en un hilo para no
+    bloquear el event loop; los bytes ya recibidos se decodifican directamente,
+    sin pasar por un archivo temporal.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return await asyncio.to_thread(decode_image, source)
+    return await asyncio.to_thread(read_image, Path(source))
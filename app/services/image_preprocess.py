@@ -2,27 +2,197 @@
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict
 from pathlib import Path
+from threading import Lock
 
 import cv2
 import numpy as np
 
 from app.core.config import Settings
+from app.services.image_io import read_image
+from app.services.image_types import PreprocessedImage
 
+try:  # Optional: JIT-compiled auto-crop scan
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
 
-def preprocess_image(image_path: Path, settings: Settings, logger: logging.Logger) -> np.ndarray:
+
+# LRU of preprocessed images keyed on (path, mtime_ns, size, settings key).
+_preprocess_cache: "OrderedDict[tuple, PreprocessedImage]" = OrderedDict()
+_preprocess_cache_lock = Lock()
+
+
+class _BufferPool:
+    """Small pool of reusable uint8 scratch buffers for intermediate results.
+
+    Buffers handed out by :meth:`acquire` must be returned with :meth:`release`
+    and must never escape the function that acquired them.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._free: list[np.ndarray] = []
+        self._lock = Lock()
+
+    def configure(self, capacity: int) -> None:
+        with self._lock:
+            self._capacity = max(0, capacity)
+            del self._free[self._capacity :]
+
+    def acquire(self, shape: tuple[int, ...], dtype: type = np.uint8) -> np.ndarray:
+        with self._lock:
+            for index, buf in enumerate(self._free):
+                if buf.shape == shape and buf.dtype == dtype:
+                    return self._free.pop(index)
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, buf: np.ndarray) -> None:
+        with self._lock:
+            if self._capacity <= 0:
+                return
+            if len(self._free) >= self._capacity:
+                # Keep the most recently used shapes
+                self._free.pop(0)
+            self._free.append(buf)
+
+
+_buffer_pool = _BufferPool(capacity=4)
+
+
+def configure_buffer_pool(capacity: int) -> None:
+    """Set how many scratch buffers are kept for reuse between requests."""
+    _buffer_pool.configure(capacity)
+
+
+def configure_opencv_threads(threads: int) -> None:
+    """Limit OpenCV's internal thread pool (shared by the whole process)."""
+    cv2.setNumThreads(max(1, threads))
+
+
+def warm_up_preprocess() -> None:
+    """Compile the JIT auto-crop kernel now instead of on the first request."""
+    _text_cutoff_row(np.zeros((2, 2), dtype=np.uint8))
+
+
+def preprocess_image(
+    image_path: Path,
+    settings: Settings,
+    logger: logging.Logger,
+    image: np.ndarray | None = None,
+    file_key: tuple[str, int, int] | None = None,
+) -> PreprocessedImage:
+    """Run the full preprocessing pipeline, reusing cached results when possible.
+
+    Returns a grayscale :class:`PreprocessedImage`. The result is cached per
+    (path, mtime, size) so repeated requests for the same unchanged file skip
+    disk I/O and all OpenCV work. Cached pixels are read-only and shared
+    between callers. ``image`` may carry the already
+    decoded file (see :func:`app.services.image_io.load_image`) to avoid reading it again.
+    In that case pass ``file_key`` as well: the (path, mtime_ns, size) taken before the
+    read started, so a file overwritten meanwhile is never cached under its new stat.
+    """
+    max_entries = settings.preprocess_cache_size
+    if max_entries <= 0:
+        return PreprocessedImage(_run_pipeline(image_path, settings, logger, image), is_gray=True)
+
+    key = _cache_key(image_path, settings, file_key)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.debug("Preprocesado reutilizado desde cache para %s", image_path)
+        return cached
+
+    pixels = _run_pipeline(image_path, settings, logger, image)
+    pixels.setflags(write=False)
+    result = PreprocessedImage(pixels, is_gray=True)
+    with _preprocess_cache_lock:
+        _preprocess_cache[key] = result
+        _preprocess_cache.move_to_end(key)
+        while len(_preprocess_cache) > max_entries:
+            _preprocess_cache.popitem(last=False)
+    return result
+
+
+def preprocess_cache_lookup(
+    image_path: Path,
+    settings: Settings,
+    file_key: tuple[str, int, int] | None = None,
+) -> PreprocessedImage | None:
+    """Return the cached preprocessing result for the file, or None on a miss.
+
+    Lets callers skip reading and decoding the file when the pipeline would be
+    served from cache anyway. ``file_key`` is the same as in :func:`preprocess_image`.
+    """
+    if settings.preprocess_cache_size <= 0:
+        return None
+    return _cache_get(_cache_key(image_path, settings, file_key))
+
+
+def file_cache_key(image_path: Path) -> tuple[str, int, int]:
+    """(path, mtime_ns, size) identifying the current contents of the file."""
+    stat = image_path.stat()
+    return (str(image_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_key(image_path: Path, settings: Settings, file_key: tuple[str, int, int] | None = None) -> tuple:
+    if file_key is None:
+        file_key = file_cache_key(image_path)
+    return (*file_key, _settings_key(settings))
+
+
+def _cache_get(key: tuple) -> PreprocessedImage | None:
+    with _preprocess_cache_lock:
+        cached = _preprocess_cache.get(key)
+        if cached is not None:
+            _preprocess_cache.move_to_end(key)
+    return cached
+
+
+def preprocess_cache_clear() -> None:
+    """Discard every cached preprocessing result."""
+    with _preprocess_cache_lock:
+        _preprocess_cache.clear()
+
+
+def _settings_key(settings: Settings) -> int:
+    """Hash of the settings that influence the preprocessing output."""
+    return hash(
+        (
+            settings.max_image_dimension,
+            settings.preprocess_autoconfig,
+            settings.preprocess_enable_denoise,
+            settings.preprocess_enable_binarize,
+            settings.preprocess_max_deskew_degrees,
+            settings.denoise_algorithm,
+            settings.denoise_h,
+            settings.denoise_template_window_size,
+            settings.denoise_search_window_size,
+            settings.ocr_crop_height_percent,
+        )
+    )
+
+
+def _run_pipeline(
+    image_path: Path,
+    settings: Settings,
+    logger: logging.Logger,
+    image: np.ndarray | None = None,
+) -> np.ndarray:
     """Run the full preprocessing pipeline.
 
     If settings.preprocess_autoconfig is True, apply heuristics per image to
     improve contrast, sharpness and decide a top crop percent automatically.
     Otherwise, use manual flags in settings and the configured crop percent.
     """
-    logger.info("Cargando imagen desde %s", image_path)
-    image = cv2.imread(str(image_path))
+    if image is None:
+        logger.info("Cargando imagen desde %s", image_path)
+        image = read_image(image_path)
     if image is None:
         raise ValueError(f"No se pudo cargar la imagen {image_path}.")
 
-    logger.debug("Dimensiones originales: %s", image.shape)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Dimensiones originales: %s", image.shape)
 
     image = resize_if_needed(image, settings.max_image_dimension, logger)
     image = deskew_image(image, settings, logger)
@@ -32,7 +202,8 @@ def preprocess_image(image_path: Path, settings: Settings, logger: logging.Logge
         # Metrics
         blur_score = variance_of_laplacian(gray)
         contrast = float(gray.std())
-        logger.debug("Metrics: blur=%.1f, contrast=%.1f", blur_score, contrast)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Metrics: blur=%.1f, contrast=%.1f", blur_score, contrast)
 
         # Contrast enhancement for low-contrast photos
         if contrast < 60:
@@ -69,7 +240,8 @@ def preprocess_image(image_path: Path, settings: Settings, logger: logging.Logge
             logger.info("Aplicando recorte superior %d%% (manual)", pct)
             gray = crop_top_percent(gray, pct)
 
-    logger.debug("Preprocesamiento completado. Dimensiones finales: %s", gray.shape)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Preprocesamiento completado. Dimensiones finales: %s", gray.shape)
     return gray
 
 
@@ -84,27 +256,50 @@ def resize_if_needed(image: np.ndarray, max_dimension: int, logger: logging.Logg
     new_w = int(w * scale)
     new_h = int(h * scale)
     logger.info("Redimensionando imagen de %sx%s a %sx%s para optimizar el procesamiento.", w, h, new_w, new_h)
-    return cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+    # For 2x or larger reductions, halve with pyrDown (separable, vectorized Gaussian)
+    # while the result stays at or above the target; INTER_AREA does the final step.
+    # Exact integer ratios are left to INTER_AREA, which has its own fast path for them.
+    exact_ratio = w % new_w == 0 and h % new_h == 0 and w // new_w == h // new_h
+    pyramid_steps = 0
+    while not exact_ratio and (max(image.shape[:2]) + 1) // 2 >= max_dimension:
+        image = cv2.pyrDown(image)
+        pyramid_steps += 1
+    if image.shape[:2] != (new_h, new_w):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    logger.debug("Reescalado con %d paso(s) pyrDown + ajuste INTER_AREA.", pyramid_steps)
+    return image
 
 
 def deskew_image(image: np.ndarray, settings: Settings, logger: logging.Logger) -> np.ndarray:
     """Correct small skew angles. Avoid large rotations (which often hurt OCR)."""
-    gray = convert_to_grayscale(image)
-    gray_inv = cv2.bitwise_not(gray)
-    thresh = cv2.threshold(gray_inv, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
-
-    coords = np.column_stack(np.where(thresh > 0))
-    if coords.size == 0:
+    # Grayscale, inversion and threshold all happen in place on one pooled buffer
+    thresh = _buffer_pool.acquire(image.shape[:2])
+    try:
+        if image.ndim == 2:
+            cv2.bitwise_not(image, dst=thresh)
+        else:
+            cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=thresh)
+            cv2.bitwise_not(thresh, dst=thresh)
+        cv2.threshold(thresh, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU, dst=thresh)
+
+        # findNonZero returns compact (x, y) points that minAreaRect consumes directly
+        coords = cv2.findNonZero(thresh)
+    finally:
+        _buffer_pool.release(thresh)
+    if coords is None:
         return image
 
+    # Normalize to [-45, 45] regardless of the OpenCV angle convention in use
     angle = cv2.minAreaRect(coords)[-1]
-    if angle < -45:
-        angle = -(90 + angle)
-    else:
-        angle = -angle
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
 
     if abs(angle) < 0.5:
-        logger.debug("No se detecto inclinacion significativa (%.2f grados).", angle)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("No se detecto inclinacion significativa (%.2f grados).", angle)
         return image
 
     if abs(angle) > settings.preprocess_max_deskew_degrees:
@@ -142,12 +337,24 @@ def enhance_contrast_clahe(gray: np.ndarray, logger: logging.Logger) -> np.ndarr
 
 def unsharp_mask(gray: np.ndarray, amount: float = 1.0, radius: int = 3) -> np.ndarray:
     k = radius if radius % 2 == 1 else radius + 1
-    blurred = cv2.GaussianBlur(gray, (k, k), 0)
-    sharpened = cv2.addWeighted(gray, 1 + amount, blurred, -amount, 0)
-    return np.clip(sharpened, 0, 255).astype(np.uint8)
+    blurred = _buffer_pool.acquire(gray.shape, gray.dtype)
+    try:
+        cv2.GaussianBlur(gray, (k, k), 0, dst=blurred)
+        # addWeighted saturates to uint8 by itself, no clip/astype pass needed
+        return cv2.addWeighted(gray, 1 + amount, blurred, -amount, 0, dtype=cv2.CV_8U)
+    finally:
+        _buffer_pool.release(blurred)
 
 
 def reduce_noise(image: np.ndarray, settings: Settings, logger: logging.Logger) -> np.ndarray:
+    algorithm = settings.denoise_algorithm
+    if algorithm == "bilateral":
+        logger.debug("Aplicando reduccion de ruido con bilateralFilter.")
+        return cv2.bilateralFilter(image, d=5, sigmaColor=50, sigmaSpace=50)
+    if algorithm == "median":
+        logger.debug("Aplicando reduccion de ruido con medianBlur.")
+        return cv2.medianBlur(image, 3)
+
     logger.debug("Aplicando reduccion de ruido con fastNlMeansDenoising.")
     return cv2.fastNlMeansDenoising(
         image,
@@ -177,23 +384,63 @@ def variance_of_laplacian(gray: np.ndarray) -> float:
 def decide_crop_percent(gray: np.ndarray, logger: logging.Logger) -> int:
     """Estimate how much of the top contains ~95% of text density (50-100%)."""
     h, w = gray.shape[:2]
+    th = _buffer_pool.acquire(gray.shape[:2])
     try:
-        _, th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    except Exception:
+        try:
+            cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=th)
+        except Exception:
+            return 100
+        y = int(_text_cutoff_row(th))
+    finally:
+        _buffer_pool.release(th)
+    if y < 0:
         return 100
-    inv = cv2.bitwise_not(th)
-    row_density = (inv > 0).sum(axis=1).astype(np.float32)
-    total = float(row_density.sum())
-    if total <= 0.0:
-        return 100
-    cumsum = np.cumsum(row_density)
-    y = int(np.searchsorted(cumsum, 0.95 * total))
     pct = int(np.ceil((y + 1) * 100.0 / h))
     pct = max(50, min(100, pct))
-    logger.debug("Auto-crop decidido: %d%% (fila=%d de %d)", pct, y, h)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Auto-crop decidido: %d%% (fila=%d de %d)", pct, y, h)
     return pct
 
 
+def _text_cutoff_row_numpy(th: np.ndarray) -> int:
+    """Row where text pixels (zeros of the Otsu mask) reach 95% of the total, -1 if none."""
+    cumsum = np.count_nonzero(th == 0, axis=1).cumsum(dtype=np.int64)
+    total = int(cumsum[-1])
+    if total <= 0:
+        return -1
+    return int(np.searchsorted(cumsum, (total * 95 + 99) // 100))
+
+
+def _text_cutoff_row_loops(th: np.ndarray) -> int:
+    """Same as :func:`_text_cutoff_row_numpy` as plain loops, meant to be JIT-compiled."""
+    h, w = th.shape
+    counts = np.zeros(h, dtype=np.int64)
+    total = 0
+    for r in range(h):
+        count = 0
+        for c in range(w):
+            if th[r, c] == 0:
+                count += 1
+        counts[r] = count
+        total += count
+    if total <= 0:
+        return -1
+    target = (total * 95 + 99) // 100
+    acc = 0
+    for r in range(h):
+        acc += counts[r]
+        if acc >= target:
+            return r
+    return h - 1
+
+
+# Single streaming pass with numba when available; numpy otherwise
+if njit is not None:
+    _text_cutoff_row = njit(cache=True, nogil=True)(_text_cutoff_row_loops)
+else:
+    _text_cutoff_row = _text_cutoff_row_numpy
+
+
 def crop_top_percent(gray: np.ndarray, percent: int) -> np.ndarray:
     """Crop top percent of the image height."""
     h, w = gray.shape[:2]
@@ -0,0 +1,35 @@
+"""Contrato de imagen entre el preprocesado y el motor OCR."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PreprocessedImage:
+    """Imagen lista para OCR.
+
+    ``pixels`` es uint8 en escala de grises ``(alto, ancho)`` cuando ``is_gray``
+    es verdadero, o BGR ``(alto, ancho, 3)`` en otro caso. El preprocesado la
+    produce en escala de grises; para imágenes de otro origen usa
+    :meth:`from_array`.
+    """
+
+    pixels: np.ndarray
+    is_gray: bool
+
+    @classmethod
+    def from_array(cls, image: np.ndarray) -> PreprocessedImage:
+        """Adapta un ndarray de OpenCV (gris, gris con canal, BGR o BGRA) al contrato."""
+        if image.ndim == 2:
+            return cls(image, True)
+        channels = image.shape[2]
+        if channels == 1:
+            return cls(image[:, :, 0], True)
+        if channels == 3:
+            return cls(image, False)
+        if channels == 4:
+            return cls(cv2.cvtColor(image, cv2.COLOR_BGRA2BGR), False)
+        raise ValueError(f"Número de canales no soportado: {channels}")
@@ -0,0 +1,31 @@
+"""Coalescencia de peticiones idénticas en curso (patrón single-flight)."""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class InFlightRequests:
+    """Comparte el resultado de una corrutina entre peticiones concurrentes con la misma clave.
+
+    Solo debe usarse desde el event loop: el registro no necesita lock porque no
+    hay ``await`` entre la consulta y el alta de una clave.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, coro_factory: Callable[[], Awaitable[T]]) -> T:
+        """Ejecuta ``coro_factory()`` o espera la ejecución ya en curso para ``key``."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        # shield: si un cliente se desconecta no se cancela el trabajo compartido
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
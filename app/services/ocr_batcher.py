@@ -0,0 +1,92 @@
+"""Agrupación de peticiones OCR concurrentes en lotes (micro-batching)."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+
+from app.services.image_types import PreprocessedImage
+from app.services.ocr_engine import PaddleOcrEngine
+
+
+class OcrBatcher:
+    """Acumula imágenes en una cola y las envía a PaddleOCR en lotes.
+
+    Un lote se despacha cuando alcanza ``max_batch`` imágenes o cuando la más
+    antigua lleva ``max_wait_s`` segundos esperando. Se ejecutan como máximo
+    ``max_parallel`` lotes a la vez (uno por instancia del pool del motor).
+    """
+
+    def __init__(
+        self,
+        engine: PaddleOcrEngine,
+        executor: Executor,
+        max_batch: int,
+        max_wait_s: float,
+        max_parallel: int,
+        logger: logging.Logger,
+    ) -> None:
+        self._engine = engine
+        self._executor = executor
+        self._max_batch = max_batch
+        self._max_wait_s = max_wait_s
+        self._slots = asyncio.Semaphore(max_parallel)
+        self._logger = logger
+        self._queue: asyncio.Queue[tuple[PreprocessedImage, asyncio.Future[str]]] = asyncio.Queue()
+        self._runner: asyncio.Task | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, *self._batches, return_exceptions=True)
+            self._runner = None
+
+    async def submit(self, image: PreprocessedImage) -> str:
+        """Encola una imagen y espera el texto reconocido."""
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait_s
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()
+            task = asyncio.create_task(self._process(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _process(self, batch: list[tuple[PreprocessedImage, asyncio.Future[str]]]) -> None:
+        try:
+            pending = [(image, future) for image, future in batch if not future.done()]
+            if not pending:
+                return
+            self._logger.debug("Despachando lote OCR de %d imágenes.", len(pending))
+            try:
+                loop = asyncio.get_running_loop()
+                texts = await loop.run_in_executor(
+                    self._executor, self._engine.recognize_batch, [image for image, _ in pending]
+                )
+            except Exception as error:  # noqa: BLE001 - se propaga a cada petición del lote
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            for (_, future), text in zip(pending, texts):
+                if not future.done():
+                    future.set_result(text)
+        finally:
+            self._slots.release()
@@ -1,21 +1,34 @@
 """Encapsulamiento del motor OCR basado en PaddleOCR."""
 from __future__ import annotations
 
+import hashlib
 import logging
+import queue
+import re
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import chain
 from threading import Lock
-from typing import Iterable, List
+from typing import Any, Iterator
 
 import cv2
 import numpy as np
 from paddleocr import PaddleOCR
 
+try:
+    from paddlex.utils.deps import DependencyError as _HpiDependencyError
+except ImportError:  # PaddleOCR 2.x no depende de PaddleX
+    _HpiDependencyError = ImportError
+
 from app.core.config import Settings
+from app.services.image_types import PreprocessedImage
 
 
 class OcrEngineInterface:
     """Interfaz mínima para motores OCR."""
 
-    def recognize_text(self, image: np.ndarray) -> str:
+    def recognize_text(self, image: PreprocessedImage) -> str:
         """Realiza OCR sobre una imagen y devuelve el texto reconocido."""
         raise NotImplementedError
 
@@ -30,43 +43,79 @@ class PaddleOcrEngine(OcrEngineInterface):
     def __init__(self, settings: Settings, logger: logging.Logger) -> None:
         self._logger = logger
         self._settings = settings
-        self._lock = Lock()
-        self._ocr: PaddleOCR | None = None
         self._device = "gpu" if settings.ocr_use_gpu else "cpu"
+        # Pool de instancias PaddleOCR: cada petición concurrente usa la suya
+        self._pool_size = settings.effective_ocr_pool_size
+        self._pool: queue.Queue[_PooledEngine] = queue.Queue()
+        self._created = 0
+        self._init_lock = Lock()
+        # Reparte los núcleos entre las instancias para no sobresuscribir la CPU
+        self._cpu_threads = settings.native_threads_per_worker
+        # PaddleOCR 2.6 no admite listas de imágenes con detección activa
+        self._legacy_api = False
+        self._precision = self._resolve_precision()
+        # Cache LRU de textos por contenido de la imagen (hash de los píxeles)
+        self._cache: OrderedDict[bytes, str] = OrderedDict()
+        self._cache_lock = Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        if settings.ocr_use_gpu and self._pool_size > 1:
+            self._logger.warning(
+                "Pool de %d instancias PaddleOCR en GPU: cada una reserva su propia VRAM. "
+                "Reduce OCR_POOL_SIZE si aparecen errores de memoria de CUDA.",
+                self._pool_size,
+            )
 
-    def _ensure_initialized(self) -> None:
-        if self._ocr is not None:
-            return
+    def _resolve_precision(self) -> str:
+        """Valida la precisión configurada y devuelve la que se usará realmente.
+
+        FP16 solo acelera en GPU y PaddleOCR lo aplica a través de TensorRT; en CPU
+        se recurre a FP32 con un aviso.
+        """
+        precision = self._settings.ocr_precision
+        if precision == "fp32":
+            return precision
+        if not self._settings.ocr_use_gpu:
+            self._logger.warning("Precisión %s solo disponible en GPU. Se usa fp32.", precision)
+            return "fp32"
+        return precision
+
+    def _create_engine(self) -> PaddleOCR:
         # Inicialización perezosa para evitar fallos de arranque cuando falta paddle
         try:
             # Newer PaddleOCR (>=2.7) signature
-            self._ocr = PaddleOCR(
-                lang=self._settings.ocr_language,
-                device=self._device,
-                enable_mkldnn=self._settings.ocr_enable_mkldnn,
-                use_textline_orientation=self._settings.ocr_angle_classifier,
-                use_doc_orientation_classify=False,
-                use_doc_unwarping=False,
-            )
+            ocr, hpi = self._create_modern_engine()
             self._logger.info(
-                "Motor PaddleOCR inicializado (lang=%s, device=%s, mkldnn=%s)",
+                "Motor PaddleOCR inicializado (lang=%s, device=%s, mkldnn=%s, cpu_threads=%s, hpi=%s, precision=%s)",
                 self._settings.ocr_language,
                 self._device,
                 self._settings.ocr_enable_mkldnn,
+                self._cpu_threads,
+                hpi,
+                self._precision,
             )
         except TypeError:
             # Backward compatibility with PaddleOCR 2.6.x (no 'device' or 'use_textline_orientation')
-            self._ocr = PaddleOCR(
+            ocr = PaddleOCR(
                 lang=self._settings.ocr_language,
                 use_angle_cls=self._settings.ocr_angle_classifier,
                 enable_mkldnn=self._settings.ocr_enable_mkldnn,
+                cpu_threads=self._cpu_threads,
                 use_gpu=self._settings.ocr_use_gpu,
+                rec_batch_num=self._settings.ocr_rec_batch_num,
+                det_model_dir=self._settings.ocr_det_model_dir,
+                rec_model_dir=self._settings.ocr_rec_model_dir,
+                precision=self._precision,
+                use_tensorrt=self._use_tensorrt,
+                **self._det_limit_kwargs("det_limit_side_len", "det_limit_type"),
             )
+            self._legacy_api = True
             self._logger.info(
-                "Motor PaddleOCR inicializado (lang=%s, device=%s, mkldnn=%s) [compat 2.6]",
+                "Motor PaddleOCR inicializado (lang=%s, device=%s, mkldnn=%s, cpu_threads=%s) [compat 2.6]",
                 self._settings.ocr_language,
                 self._device,
                 self._settings.ocr_enable_mkldnn,
+                self._cpu_threads,
             )
         except ModuleNotFoundError as e:
             # Mensaje claro cuando falta 'paddle'
@@ -76,65 +125,361 @@ class PaddleOcrEngine(OcrEngineInterface):
                     "En CPU suele ser 'paddlepaddle'. Verifica además compatibilidad de versión de Python."
                 )
             raise
+        return ocr
+
+    def _create_modern_engine(self) -> tuple[PaddleOCR, bool]:
+        """Construye PaddleOCR 3.x, con inferencia de alto rendimiento (HPI) si está disponible.
 
-    def recognize_text(self, image: np.ndarray) -> str:
-        """Procesa la imagen y devuelve el texto detectado."""
-        if image.ndim == 2:
-            image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-        elif image.shape[2] == 3:
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        HPI elige automáticamente el backend (Paddle Inference, OpenVINO, ONNX Runtime
+        o TensorRT) pero requiere dependencias opcionales; si no se puede construir con
+        HPI se registra un aviso y se usa la inferencia estándar. Un ``TypeError`` se
+        propaga para activar la rama de compatibilidad con 2.6.
+        """
+        kwargs = dict(
+            lang=self._settings.ocr_language,
+            device=self._device,
+            enable_mkldnn=self._settings.ocr_enable_mkldnn,
+            cpu_threads=self._cpu_threads,
+            precision=self._precision,
+            use_tensorrt=self._use_tensorrt,
+            text_recognition_batch_size=self._settings.ocr_rec_batch_num,
+            use_textline_orientation=self._settings.ocr_angle_classifier,
+            use_doc_orientation_classify=False,
+            use_doc_unwarping=False,
+            **self._det_limit_kwargs("text_det_limit_side_len", "text_det_limit_type"),
+            **self._model_kwargs(),
+        )
+        if self._settings.ocr_enable_hpi:
+            try:
+                return PaddleOCR(enable_hpi=True, **kwargs), True
+            except (TypeError, ModuleNotFoundError) as error:
+                if isinstance(error, TypeError) or error.name == "paddle":
+                    raise
+                self._log_hpi_fallback(error)
+            except (_HpiDependencyError, RuntimeError) as error:
+                # Plugin HPI no instalado o sin backend compatible con el modelo/dispositivo
+                self._log_hpi_fallback(error)
+        return PaddleOCR(**kwargs), False
+
+    def _log_hpi_fallback(self, error: Exception) -> None:
+        self._logger.warning(
+            "HPI no disponible (%s: %s). Se usa la inferencia estándar.", type(error).__name__, error
+        )
+
+    @property
+    def _use_tensorrt(self) -> bool:
+        """PaddleOCR solo usa ``precision`` con TensorRT (``run_mode`` trt_fp16)."""
+        return self._precision == "fp16"
+
+    def _model_kwargs(self) -> dict[str, Any]:
+        """Modelos de detección/reconocimiento propios para PaddleOCR 3.x.
+
+        En cuanto se fija un nombre o directorio de modelo, PaddleOCR ignora ``lang``;
+        por eso el lado no configurado se completa con el modelo del idioma y cada
+        directorio viaja con su nombre (PaddleX exige que coincida con su inference.yml).
+        """
+        settings = self._settings
+        det_name, det_dir = settings.ocr_det_model_name, settings.ocr_det_model_dir
+        rec_name, rec_dir = settings.ocr_rec_model_name, settings.ocr_rec_model_dir
+        if det_name is None and det_dir is None and rec_name is None and rec_dir is None:
+            return {}
+        lang_det, lang_rec = self._lang_model_names()
+        return {
+            "text_detection_model_name": det_name or lang_det,
+            "text_detection_model_dir": det_dir,
+            "text_recognition_model_name": rec_name or lang_rec,
+            "text_recognition_model_dir": rec_dir,
+        }
+
+    def _lang_model_names(self) -> tuple[str | None, str | None]:
+        """Modelos (detección, reconocimiento) que PaddleOCR 3.x elige para ``ocr_language``."""
+        resolve = getattr(PaddleOCR, "_get_ocr_model_names", None)
+        if resolve is None:
+            return None, None
+        # No depende del estado de la instancia: se consulta sin construir el pipeline
+        return resolve(None, self._settings.ocr_language, None)
+
+    def _det_limit_kwargs(self, side_len_name: str, limit_type_name: str) -> dict[str, Any]:
+        """Límites del detector configurados explícitamente; los no definidos quedan con el valor de PaddleOCR."""
+        kwargs: dict[str, Any] = {}
+        if self._settings.ocr_det_limit_side_len is not None:
+            kwargs[side_len_name] = self._settings.ocr_det_limit_side_len
+        if self._settings.ocr_det_limit_type is not None:
+            kwargs[limit_type_name] = self._settings.ocr_det_limit_type
+        return kwargs
+
+    @contextmanager
+    def _engine(self) -> Iterator[_PooledEngine]:
+        """Toma prestada una instancia del pool durante el bloque ``with``."""
+        entry = self._acquire_engine()
+        try:
+            yield entry
+        finally:
+            self._release_engine(entry)
 
-        with self._lock:
-            # Inicializa en el primer uso
-            self._ensure_initialized()
+    def _acquire_engine(self) -> _PooledEngine:
+        """Obtiene una instancia libre del pool, creándola si aún no se alcanzó el tamaño máximo."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._init_lock:
+            if self._created < self._pool_size:
+                entry = _PooledEngine(self._create_engine())
+                self._created += 1
+                return entry
+        return self._pool.get()
+
+    def _release_engine(self, entry: _PooledEngine) -> None:
+        self._pool.put(entry)
+
+    def _cache_key(self, image: np.ndarray) -> bytes | None:
+        """Hash del contenido de la imagen (forma, tipo y píxeles), o None si la cache está desactivada."""
+        if self._settings.ocr_cache_entries <= 0:
+            return None
+        digest = hashlib.blake2b(f"{image.shape}{image.dtype.str}".encode(), digest_size=16)
+        digest.update(np.ascontiguousarray(image).data)
+        return digest.digest()
+
+    def _cache_get(self, key: bytes | None) -> str | None:
+        if key is None:
+            return None
+        with self._cache_lock:
+            text = self._cache.get(key)
+            if text is None:
+                self._cache_misses += 1
+            else:
+                self._cache_hits += 1
+                self._cache.move_to_end(key)
+            return text
+
+    def _cache_put(self, key: bytes | None, text: str) -> None:
+        if key is None:
+            return
+        with self._cache_lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._settings.ocr_cache_entries:
+                self._cache.popitem(last=False)
+
+    def cache_stats(self) -> dict:
+        """Estadísticas de la cache de resultados OCR."""
+        with self._cache_lock:
+            return {
+                "entries": len(self._cache),
+                "max_entries": self._settings.ocr_cache_entries,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+            }
+
+    def recognize_text(self, image: PreprocessedImage) -> str:
+        """Procesa la imagen y devuelve el texto detectado.
+
+        Las imágenes con el mismo contenido reutilizan el texto ya reconocido y
+        las páginas en blanco devuelven texto vacío sin ejecutar PaddleOCR.
+        """
+        if _is_blank(image.pixels, self._settings.ocr_blank_std_threshold):
+            self._logger.debug("Imagen sin contenido (desviación típica baja); se omite el OCR.")
+            return ""
+
+        key = self._cache_key(image.pixels)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self._logger.debug("Resultado OCR obtenido de la cache.")
+            return cached
+
+        pixels = _maybe_downscale(image.pixels, self._settings.ocr_max_side)
+        with self._engine() as entry:
+            if image.is_gray:
+                pixels = entry.gray_to_bgr(pixels)
             self._logger.debug("Ejecutando OCR sobre la imagen preprocesada.")
-            assert self._ocr is not None
-            result = self._ocr.ocr(image)
-
-        texts: List[str] = []
-        for line in result:
-            if not line:
-                continue
-            # PaddleOCR 3.x (OCRResult dict-like)
-            if hasattr(line, "get"):
-                try:
-                    rec_texts = line.get("rec_texts")
-                except Exception:
-                    rec_texts = None
-                if rec_texts:
-                    for t in rec_texts:
-                        if t is not None:
-                            texts.append(str(t))
-                    continue
-            # PaddleOCR 2.x ([(poly, (text, score)), ...])
-            if isinstance(line, (list, tuple)):
-                for det in line:
-                    if not det:
-                        continue
-                    try:
-                        cand = det[1]
-                        if isinstance(cand, (list, tuple)) and len(cand) >= 1:
-                            texts.append(str(cand[0]))
-                            continue
-                    except Exception:
-                        pass
-                    if isinstance(det, dict) and "text" in det:
-                        texts.append(str(det["text"]))
-        extracted_text = "\n".join(clean_segments(texts))
+            result = entry.ocr.ocr(pixels)
+
+        extracted_text = "\n".join(extract_result_texts(result))
         cleaned = postprocess_text(extracted_text)
-        self._logger.debug("OCR completado. Caracteres extraidos: {0} -> {1} tras limpieza", len(extracted_text), len(cleaned))
+        self._logger.debug("OCR completado. Caracteres extraídos: %s -> %s tras limpieza", len(extracted_text), len(cleaned))
+        self._cache_put(key, cleaned)
         return cleaned
-        self._logger.debug("OCR completado. Caracteres extraídos: %s", len(extracted_text))
-        return extracted_text
+
+    def recognize_batch(self, images: list[PreprocessedImage]) -> list[str]:
+        """Procesa varias imágenes en una sola invocación de PaddleOCR.
+
+        Devuelve un texto por imagen, en el mismo orden. Con PaddleOCR 2.6 las
+        imágenes se procesan una a una con la misma instancia.
+        """
+        keys: list[bytes | None] = []
+        texts: list[str | None] = []
+        for image in images:
+            if _is_blank(image.pixels, self._settings.ocr_blank_std_threshold):
+                keys.append(None)
+                texts.append("")
+            else:
+                keys.append(self._cache_key(image.pixels))
+                texts.append(self._cache_get(keys[-1]))
+        missing = [index for index, text in enumerate(texts) if text is None]
+        if not missing:
+            return texts
+
+        inputs = [_to_engine_input(images[index], self._settings.ocr_max_side) for index in missing]
+        with self._engine() as entry:
+            self._logger.debug("Ejecutando OCR por lotes sobre %d imágenes.", len(inputs))
+            if self._legacy_api:
+                results = [entry.ocr.ocr(image) for image in inputs]
+            else:
+                # PaddleOCR 3.x devuelve un OCRResult por imagen de la lista
+                results = [[page] for page in entry.ocr.ocr(inputs)]
+
+        for index, result in zip(missing, results):
+            texts[index] = postprocess_text("\n".join(extract_result_texts(result)))
+            self._cache_put(keys[index], texts[index])
+        return texts
+
+    def warm_up(self, sizes: tuple[tuple[int, int], ...] = ((640, 640), (960, 960), (1280, 1280))) -> None:
+        """Crea todas las instancias del pool y ejecuta OCR de prueba en cada una.
+
+        La primera inferencia de PaddleOCR construye el grafo y selecciona kernels,
+        lo que añade varios segundos; así ese coste se paga en el arranque y no en
+        la primera petición. Debe llamarse antes de recibir tráfico.
+        """
+        dummies = []
+        for height, width in sizes:
+            dummy = np.full((height, width, 3), 255, dtype=np.uint8)
+            # Texto sintético para ejercitar también el reconocedor, no solo el detector
+            cv2.putText(dummy, "OCR 0123", (width // 10, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (0, 0, 0), 3)
+            dummies.append(dummy)
+
+        entries: list[_PooledEngine] = []
+        try:
+            for _ in range(self._pool_size):
+                entries.append(self._acquire_engine())
+            for entry in entries:
+                for dummy in dummies:
+                    entry.ocr.ocr(dummy)
+        finally:
+            for entry in entries:
+                self._release_engine(entry)
+        self._logger.info("Precalentamiento completado en %d instancia(s) PaddleOCR.", len(entries))
 
     def is_ready(self) -> bool:
-        return self._ocr is not None
+        return self._created > 0
+
+
+class _PooledEngine:
+    """Instancia de PaddleOCR del pool junto con su buffer de conversión reutilizable."""
+
+    __slots__ = ("ocr", "_bgr")
+
+    def __init__(self, ocr: PaddleOCR) -> None:
+        self.ocr = ocr
+        self._bgr: np.ndarray | None = None
+
+    def gray_to_bgr(self, image: np.ndarray) -> np.ndarray:
+        """Expande una imagen en escala de grises a BGR sobre un buffer propio de la instancia.
 
+        El resultado solo es válido mientras se tenga prestada la instancia.
+        """
+        shape = (*image.shape, 3)
+        if self._bgr is None or self._bgr.shape != shape or self._bgr.dtype != image.dtype:
+            self._bgr = np.empty(shape, dtype=image.dtype)
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR, dst=self._bgr)
+
+
+def _is_blank(image: np.ndarray, std_threshold: float) -> bool:
+    """Indica si la imagen es prácticamente uniforme (página en blanco, hoja separadora).
+
+    ``cv2.meanStdDev`` recorre la imagen una sola vez sin arrays temporales; con
+    ``std_threshold`` 0 la comprobación se desactiva.
+    """
+    if std_threshold <= 0 or image.size == 0:
+        return std_threshold > 0
+    _, stddev = cv2.meanStdDev(image)
+    return float(stddev.max()) < std_threshold
+
+
+def _maybe_downscale(image: np.ndarray, max_side: int) -> np.ndarray:
+    """Reduce la imagen con INTER_AREA para que su lado mayor no supere ``max_side`` (0 = sin límite).
+
+    El coste del detector crece con el cuadrado del lado y su calidad se satura
+    mucho antes de 4K; INTER_AREA evita el aliasing del texto pequeño.
+    """
+    height, width = image.shape[:2]
+    longest = max(height, width)
+    if max_side <= 0 or longest <= max_side:
+        return image
+    scale = max_side / longest
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
 
-def clean_segments(segments: Iterable[str]) -> Iterable[str]:
-    """Limpia segmentos de texto eliminando espacios innecesarios."""
-    for segment in segments:
-        yield segment.strip()
+
+def _to_engine_input(image: PreprocessedImage, max_side: int) -> np.ndarray:
+    """Adapta la imagen al formato de entrada de PaddleOCR.
+
+    PaddleOCR trata los ndarray como BGR (convención de OpenCV): las imágenes en
+    color se pasan sin copia y solo las de escala de grises se expanden.
+    """
+    pixels = _maybe_downscale(image.pixels, max_side)
+    if image.is_gray:
+        return cv2.cvtColor(pixels, cv2.COLOR_GRAY2BGR)
+    return pixels
+
+
+def extract_result_texts(result: Any) -> list[str]:
+    """Extrae los segmentos de texto no vacíos del resultado de PaddleOCR.
+
+    El formato se decide una sola vez a partir de la primera página: PaddleOCR
+    3.x devuelve ``OCRResult`` (dict) con ``rec_texts`` y 2.x listas de
+    detecciones ``[poly, (texto, score)]``.
+    """
+    pages = [page for page in result or () if page]
+    if not pages:
+        return []
+    first = pages[0]
+    if hasattr(first, "get"):
+        texts = chain.from_iterable(page.get("rec_texts") or () for page in pages)
+    elif isinstance(first, (list, tuple)):
+        texts = (_legacy_detection_text(det) for page in pages for det in page if det)
+    else:
+        return []
+    return [segment for segment in (str(text).strip() for text in texts if text is not None) if segment]
+
+
+def _legacy_detection_text(det: Any) -> Any:
+    """Texto de una detección de PaddleOCR 2.x (``[poly, (texto, score)]`` o dict con ``text``)."""
+    if isinstance(det, (list, tuple)) and len(det) > 1:
+        cand = det[1]
+        if isinstance(cand, (list, tuple)) and cand:
+            return cand[0]
+    elif isinstance(det, dict):
+        return det.get("text")
+    return None
+
+
+# Common mojibake fixes (UTF-8 mis-decoded as Latin-1)
+_MOJIBAKE = {
+    "\u00C3\u00A1": "\u00E1",  # Ã¡ -> á
+    "\u00C3\u00A9": "\u00E9",  # Ã© -> é
+    "\u00C3\u00AD": "\u00ED",  # Ã­ -> í
+    "\u00C3\u00B3": "\u00F3",  # Ã³ -> ó
+    "\u00C3\u00BA": "\u00FA",  # Ãº -> ú
+    "\u00C3\u00B1": "\u00F1",  # Ã± -> ñ
+    "\u00C3\u0081": "\u00C1",  # Ã -> Á (rare)
+    "\u00C3\u0089": "\u00C9",  # -> É
+    "\u00C3\u0093": "\u00D3",  # -> Ó
+    "\u00C3\u009A": "\u00DA",  # -> Ú
+    "\u00C3\u0091": "\u00D1",  # -> Ñ
+    "\u00C2\u00B0": "\u00B0",  # Â° -> °
+    "\u00C2\u00BA": "\u00BA",  # Âº -> º
+    "\u00C2\u00AA": "\u00AA",  # Âª -> ª
+}
+# Longest keys first so multi-byte sequences win over any shorter prefix
+_MOJIBAKE_RE = re.compile("|".join(map(re.escape, sorted(_MOJIBAKE, key=len, reverse=True))))
+# Tabs are left to the whitespace collapse; the remaining control chars include
+# line breaks for str.splitlines() (\v, \f, \x1c-\x1e) and must become spaces first
+_CTRL_RE = re.compile(r"[\u0000-\u0008\u000B\u000C\u000E-\u001F\u007F]")
+
+
+def _fix_mojibake(match: re.Match[str]) -> str:
+    return _MOJIBAKE[match.group(0)]
 
 
 def postprocess_text(text: str) -> str:
@@ -145,39 +490,20 @@ def postprocess_text(text: str) -> str:
     - Fix frequent mojibake sequences for Spanish accents and degree symbol
     - Collapse excessive whitespace; trim lines
     """
-    import re
-    import unicodedata
-
+    if not text:
+        return ""
     s = unicodedata.normalize("NFC", text)
 
-    # Common mojibake fixes (UTF-8 mis-decoded as Latin-1)
-    replacements = {
-        "\u00C3\u00A1": "\u00E1",  # Ã¡ -> á
-        "\u00C3\u00A9": "\u00E9",  # Ã© -> é
-        "\u00C3\u00AD": "\u00ED",  # Ã­ -> í
-        "\u00C3\u00B3": "\u00F3",  # Ã³ -> ó
-        "\u00C3\u00BA": "\u00FA",  # Ãº -> ú
-        "\u00C3\u00B1": "\u00F1",  # Ã± -> ñ
-        "\u00C3\u0081": "\u00C1",  # Ã -> Á (rare)
-        "\u00C3\u0089": "\u00C9",  # -> É
-        "\u00C3\u0093": "\u00D3",  # -> Ó
-        "\u00C3\u009A": "\u00DA",  # -> Ú
-        "\u00C3\u0091": "\u00D1",  # -> Ñ
-        "\u00C2\u00B0": "\u00B0",  # Â° -> °
-        "\u00C2\u00BA": "\u00BA",  # Âº -> º
-        "\u00C2\u00AA": "\u00AA",  # Âª -> ª
-    }
-    for k, v in replacements.items():
-        s = s.replace(k, v)
-
-    # Remove box glyph and control chars (preserve newlines and tabs)
+    # Common mojibake fixes (UTF-8 mis-decoded as Latin-1); every key starts
+    # with \u00C2 or \u00C3, so text without them skips the regex scan
+    if "\u00C3" in s or "\u00C2" in s:
+        s = _MOJIBAKE_RE.sub(_fix_mojibake, s)
+
+    # Remove box glyph and control chars (preserve newlines and tabs).
+    # str.replace scans in C; str.translate falls back to a slow per-char path on non-ASCII text
     s = s.replace("\u25A1", "")
-    s = re.sub(r"[\u0000-\u0009\u000B\u000C\u000E-\u001F\u007F]", " ", s)
-
-    # Normalize whitespace per line
-    lines = []
-    for line in s.splitlines():
-        line = re.sub(r"\s+", " ", line).strip()
-        if line:
-            lines.append(line)
-    return "\n".join(lines)
+    s = _CTRL_RE.sub(" ", s)
+
+    # Collapse whitespace per line and drop empty lines; str.split() without
+    # arguments collapses and trims in C, with the same whitespace set as \s
+    return "\n".join(filter(None, map(" ".join, map(str.split, s.splitlines()))))
@@ -0,0 +1,56 @@
+"""Pipeline completo (preprocesado + OCR) ejecutado en procesos de trabajo."""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.core.config import Settings
+from app.core.logging_config import configure_worker_logging
+from app.services.image_preprocess import configure_opencv_threads, preprocess_image, warm_up_preprocess
+from app.services.ocr_engine import PaddleOcrEngine
+
+# Estado propio de cada proceso de trabajo, inicializado por init_worker
+_worker_settings: Settings | None = None
+_worker_engine: PaddleOcrEngine | None = None
+_worker_logger: logging.Logger | None = None
+
+
+def create_process_pool(settings: Settings, log_queue: multiprocessing.Queue) -> ProcessPoolExecutor:
+    """Crea el pool de procesos que ejecuta el pipeline fuera del GIL del proceso principal.
+
+    ``log_queue`` (ver :func:`app.core.logging_config.start_worker_log_listener`)
+    lleva los registros de los procesos de trabajo al proceso principal.
+    """
+    return ProcessPoolExecutor(
+        max_workers=settings.max_concurrent_requests,
+        initializer=init_worker,
+        initargs=(settings, log_queue),
+    )
+
+
+def init_worker(settings: Settings, log_queue: multiprocessing.Queue) -> None:
+    """Inicializa la configuración, el logging y el motor OCR del proceso de trabajo."""
+    global _worker_settings, _worker_engine, _worker_logger
+    _worker_settings = settings
+    configure_opencv_threads(settings.native_threads_per_worker)
+    if settings.ocr_warmup:
+        warm_up_preprocess()
+    _worker_logger = configure_worker_logging(settings, log_queue).getChild("worker")
+    _worker_engine = PaddleOcrEngine(settings=settings, logger=_worker_logger.getChild("ocr_engine"))
+
+
+def start_worker() -> None:
+    """Tarea vacía: enviarla al pool arranca sus procesos (y ``init_worker``) antes del tráfico."""
+
+
+def run_pipeline(image_path: Path) -> str:
+    """Preprocesa la imagen y ejecuta OCR en el proceso de trabajo actual.
+
+    Solo viaja la ruta hacia el proceso y el texto de vuelta; la imagen
+    nunca cruza la frontera entre procesos.
+    """
+    assert _worker_settings is not None and _worker_engine is not None and _worker_logger is not None
+    processed_image = preprocess_image(image_path, _worker_settings, _worker_logger.getChild("preprocess"))
+    return _worker_engine.recognize_text(processed_image)
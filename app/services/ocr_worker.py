@@ -0,0 +1,200 @@
+"""Proceso OCR compartido: un único pool de PaddleOCR al que se conectan los workers de la API.
+
+Con ``uvicorn --workers N`` cada proceso cargaría su propio modelo (N veces la
+memoria de pesos y, en GPU, N espacios de trabajo de cuDNN). Este módulo permite
+arrancar un solo proceso con el motor y que los workers de la API le envíen las
+imágenes ya preprocesadas::
+
+    python -m app.services.ocr_worker
+
+La comunicación usa ``multiprocessing.connection`` (socket Unix o TCP local,
+también disponible en Windows) autenticada con ``OCR_WORKER_AUTHKEY``.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from threading import Thread
+from typing import Any
+
+from app.core.config import Settings, get_settings
+from app.core.logging_config import configure_logging, shutdown_logging
+from app.services.image_types import PreprocessedImage
+from app.services.ocr_engine import OcrEngineInterface, PaddleOcrEngine
+
+
+def _require_authkey(settings: Settings) -> bytes:
+    """Clave de autenticación del worker; sin ella cualquiera con acceso a la dirección podría ejecutar código."""
+    if not settings.ocr_worker_authkey:
+        raise ValueError("OCR_WORKER_AUTHKEY es obligatoria cuando se usa el worker OCR compartido.")
+    return settings.ocr_worker_authkey.encode()
+
+
+def parse_address(address: str) -> str | tuple[str, int]:
+    """Convierte ``host:puerto`` en una dirección TCP; cualquier otro valor es la ruta de un socket Unix."""
+    host, sep, port = address.rpartition(":")
+    if sep and host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+class RemoteOcrEngine(OcrEngineInterface):
+    """Cliente del proceso OCR compartido con la misma interfaz que :class:`PaddleOcrEngine`.
+
+    Mantiene un pool de conexiones reutilizables, una por llamada concurrente. Las
+    consultas de estado (``is_ready``, ``cache_stats``) tienen un tiempo máximo y se
+    ejecutan en un único hilo propio: un worker colgado no acumula hilos bloqueados.
+    """
+
+    def __init__(self, settings: Settings, logger: logging.Logger) -> None:
+        assert settings.ocr_worker_address is not None
+        self._address = parse_address(settings.ocr_worker_address)
+        self._authkey = _require_authkey(settings)
+        self._logger = logger
+        self._connections: queue.Queue[Connection] = queue.Queue()
+        self._probe_timeout = settings.ocr_worker_probe_timeout_s
+        self._probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr-worker-probe")
+
+    def _call(self, command: str, payload: Any = None, timeout: float | None = None) -> Any:
+        try:
+            conn = self._connections.get_nowait()
+            reused = True
+        except queue.Empty:
+            conn = Client(self._address, authkey=self._authkey)
+            reused = False
+        try:
+            status, result = self._exchange(conn, command, payload, timeout)
+        except (EOFError, OSError) as error:
+            if not reused or isinstance(error, TimeoutError):
+                raise
+            # Conexión del pool rota (p. ej. el worker se reinició): se reintenta una vez con una nueva
+            self._logger.warning("Conexión con el worker OCR perdida; reintentando con una nueva.")
+            conn = Client(self._address, authkey=self._authkey)
+            status, result = self._exchange(conn, command, payload, timeout)
+        self._connections.put(conn)
+        if status != "ok":
+            raise RuntimeError(f"Error en el worker OCR: {result}")
+        return result
+
+    @staticmethod
+    def _exchange(conn: Connection, command: str, payload: Any, timeout: float | None) -> tuple[str, Any]:
+        """Envía un comando y espera la respuesta; si falla, la conexión se cierra y descarta.
+
+        Con ``timeout`` una respuesta que no llega a tiempo lanza ``TimeoutError``; la
+        conexión también se descarta para no leer después una respuesta atrasada.
+        """
+        try:
+            conn.send((command, payload))
+            if timeout is not None and not conn.poll(timeout):
+                raise TimeoutError(f"El worker OCR no respondió en {timeout:.1f} s")
+            return conn.recv()
+        except Exception:
+            conn.close()
+            raise
+
+    def recognize_text(self, image: PreprocessedImage) -> str:
+        return self._call("text", image)
+
+    def recognize_batch(self, images: list[PreprocessedImage]) -> list[str]:
+        return self._call("batch", images)
+
+    def _probe(self, command: str) -> Any:
+        """Consulta de estado acotada a ``ocr_worker_probe_timeout_s``, también durante la conexión."""
+        future = self._probe_executor.submit(self._call, command, None, self._probe_timeout)
+        try:
+            return future.result(timeout=self._probe_timeout)
+        except FutureTimeoutError as error:
+            raise TimeoutError(f"El worker OCR no respondió en {self._probe_timeout:.1f} s") from error
+
+    def cache_stats(self) -> dict:
+        return self._probe("stats")
+
+    def is_ready(self) -> bool:
+        try:
+            return self._probe("ready")
+        except (OSError, EOFError, RuntimeError, AuthenticationError):
+            return False
+
+    def close(self) -> None:
+        self._probe_executor.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _handle(engine: PaddleOcrEngine, command: str, payload: Any) -> Any:
+    if command == "text":
+        return engine.recognize_text(payload)
+    if command == "batch":
+        return engine.recognize_batch(payload)
+    if command == "stats":
+        return engine.cache_stats()
+    if command == "ready":
+        return engine.is_ready()
+    raise ValueError(f"Comando desconocido: {command!r}")
+
+
+def _serve_connection(conn: Connection, engine: PaddleOcrEngine, logger: logging.Logger) -> None:
+    """Atiende las peticiones de una conexión hasta que el cliente la cierra."""
+    with conn:
+        while True:
+            try:
+                command, payload = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                response = ("ok", _handle(engine, command, payload))
+            except Exception as error:  # noqa: BLE001 - se devuelve al cliente
+                logger.exception("Error atendiendo el comando %s", command)
+                response = ("error", repr(error))
+            try:
+                conn.send(response)
+            except OSError:
+                return
+
+
+def serve(settings: Settings, logger: logging.Logger) -> None:
+    """Carga el motor OCR y atiende conexiones indefinidamente."""
+    assert settings.ocr_worker_address is not None
+    engine = PaddleOcrEngine(settings=settings, logger=logger.getChild("ocr_engine"))
+    if settings.ocr_warmup:
+        engine.warm_up()
+
+    address = parse_address(settings.ocr_worker_address)
+    with Listener(address, authkey=_require_authkey(settings)) as listener:
+        logger.info("Worker OCR escuchando en %s", settings.ocr_worker_address)
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, OSError) as error:
+                logger.warning("Conexión rechazada en el worker OCR: %s", error)
+                continue
+            Thread(target=_serve_connection, args=(conn, engine, logger), daemon=True).start()
+
+
+def main() -> None:
+    """Punto de entrada de ``python -m app.services.ocr_worker``."""
+    base = get_settings()
+    if not base.ocr_worker_address:
+        raise SystemExit("Define OCR_WORKER_ADDRESS para arrancar el worker OCR.")
+    if not base.ocr_worker_authkey:
+        raise SystemExit("Define OCR_WORKER_AUTHKEY (clave secreta compartida) para arrancar el worker OCR.")
+    # Archivo de log propio para no rotar el mismo archivo desde dos procesos
+    settings = Settings(log_filename=f"worker_{base.log_filename}")
+    logger = configure_logging(settings).getChild("worker")
+    try:
+        serve(settings, logger)
+    except KeyboardInterrupt:
+        logger.info("Worker OCR detenido")
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,25 @@
 from __future__ import annotations
 
 import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-
-from app.api.routes import router
 from app.core.config import Settings, get_settings
-from app.core.logging_config import configure_logging
-from app.services.ocr_engine import PaddleOcrEngine
+
+# Limita los hilos de OpenMP/MKL antes de que numpy/paddle se importen
+os.environ.setdefault("OMP_NUM_THREADS", str(get_settings().native_threads_per_worker))
+os.environ.setdefault("MKL_NUM_THREADS", str(get_settings().native_threads_per_worker))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from app.api.responses import FastJSONResponse  # noqa: E402
+from app.api.routes import router  # noqa: E402
+from app.core.logging_config import configure_logging, shutdown_logging, start_worker_log_listener  # noqa: E402
+from app.services.inflight import InFlightRequests  # noqa: E402
+from app.services.ocr_batcher import OcrBatcher  # noqa: E402
+from app.services.image_preprocess import configure_buffer_pool, configure_opencv_threads, warm_up_preprocess  # noqa: E402
+from app.services.ocr_engine import PaddleOcrEngine  # noqa: E402
+from app.services.ocr_pipeline import create_process_pool, start_worker  # noqa: E402
+from app.services.ocr_worker import RemoteOcrEngine  # noqa: E402
 
 
 def create_application() -> FastAPI:
@@ -17,7 +28,11 @@ def create_application() -> FastAPI:
     settings: Settings = get_settings()
     logger = configure_logging(settings)
 
-    app = FastAPI(title=settings.app_name, version=settings.api_version)
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.api_version,
+        default_response_class=FastJSONResponse,
+    )
     app.include_router(router)
 
     @app.on_event("startup")
@@ -25,19 +40,78 @@ def create_application() -> FastAPI:
         logger.info("Iniciando aplicación %s", settings.app_name)
         app.state.settings = settings
         app.state.logger = logger
-        app.state.semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
-        app.state.ocr_engine = PaddleOcrEngine(settings=settings, logger=logger.getChild("ocr_engine"))
+        # Admisión: hasta una petición por hueco en cada etapa (preprocesado y OCR)
+        app.state.semaphore = asyncio.Semaphore(2 * settings.max_concurrent_requests)
+        app.state.preprocess_semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
+        app.state.ocr_semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
+        app.state.ocr_waiting = 0
+        app.state.inflight = InFlightRequests()
+        configure_buffer_pool(settings.max_concurrent_requests + 1)
+        configure_opencv_threads(settings.native_threads_per_worker)
+        if settings.ocr_warmup:
+            # Compila el kernel JIT del recorte automático (antes del fork del pool de procesos)
+            warm_up_preprocess()
+        if settings.ocr_worker_address:
+            # El modelo vive en el worker OCR compartido; este proceso solo preprocesa
+            app.state.ocr_engine = RemoteOcrEngine(settings=settings, logger=logger.getChild("ocr_engine"))
+            logger.info("OCR delegado al worker compartido en %s", settings.ocr_worker_address)
+        else:
+            app.state.ocr_engine = PaddleOcrEngine(settings=settings, logger=logger.getChild("ocr_engine"))
+        app.state.cpu_pool = None
+        if settings.ocr_use_process_pool:
+            app.state.cpu_pool = create_process_pool(settings, start_worker_log_listener())
+        if app.state.cpu_pool is not None:
+            logger.info("Pipeline OCR en pool de %d procesos", settings.max_concurrent_requests)
+            if settings.ocr_warmup:
+                # El pool crea sus procesos con el primer envío: se adelanta al arranque
+                await asyncio.get_running_loop().run_in_executor(app.state.cpu_pool, start_worker)
+        # Un hilo por instancia del pool del motor: ningún hilo queda bloqueado esperando instancia
+        app.state.ocr_executor = None
+        if app.state.cpu_pool is None:
+            app.state.ocr_executor = ThreadPoolExecutor(
+                max_workers=settings.effective_ocr_pool_size, thread_name_prefix="ocr"
+            )
+        app.state.ocr_batcher = None
+        if settings.ocr_batch_max_size > 1 and app.state.cpu_pool is None:
+            app.state.ocr_batcher = OcrBatcher(
+                engine=app.state.ocr_engine,
+                executor=app.state.ocr_executor,
+                max_batch=settings.ocr_batch_max_size,
+                max_wait_s=settings.ocr_batch_max_wait_ms / 1000.0,
+                max_parallel=settings.effective_ocr_pool_size,
+                logger=logger.getChild("ocr_batcher"),
+            )
+            app.state.ocr_batcher.start()
+            logger.info("OCR por lotes activado (máximo %d imágenes)", settings.ocr_batch_max_size)
+        if settings.ocr_warmup and app.state.ocr_executor is not None and not settings.ocr_worker_address:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            try:
+                await loop.run_in_executor(app.state.ocr_executor, app.state.ocr_engine.warm_up)
+            except Exception:  # noqa: BLE001 - el motor se inicializará en la primera petición
+                logger.exception("No se pudo precalentar el motor OCR; se inicializará bajo demanda.")
+            else:
+                logger.info("Motor OCR precalentado en %.1f segundos", loop.time() - start)
         logger.info("Aplicación %s inicializada correctamente", settings.app_name)
 
     @app.on_event("shutdown")
     async def shutdown_event() -> None:
         logger.info("Deteniendo aplicación %s", settings.app_name)
+        if app.state.ocr_batcher is not None:
+            await app.state.ocr_batcher.stop()
+        if app.state.cpu_pool is not None:
+            app.state.cpu_pool.shutdown(wait=True, cancel_futures=True)
+        if app.state.ocr_executor is not None:
+            app.state.ocr_executor.shutdown(wait=True, cancel_futures=True)
+        if isinstance(app.state.ocr_engine, RemoteOcrEngine):
+            app.state.ocr_engine.close()
+        shutdown_logging()
 
     @app.exception_handler(Exception)
-    async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:  # type: ignore[override]
+    async def global_exception_handler(request: Request, exc: Exception) -> FastJSONResponse:  # type: ignore[override]
         logger = request.app.state.logger
         logger.exception("Error no controlado en %s: %s", request.url.path, exc)
-        return JSONResponse(status_code=500, content={"detail": "Error interno inesperado", "path": request.url.path})
+        return FastJSONResponse(status_code=500, content={"detail": "Error interno inesperado", "path": request.url.path})
 
     return app
 
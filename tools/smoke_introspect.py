@@ -19,8 +19,8 @@ def main():
     cv2.putText(img, "FACTURA 123 ABC", (20, 120), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 3, cv2.LINE_AA)
 
     try:
-        eng._ensure_initialized()
-        res = eng._ocr.ocr(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        ocr = eng._create_engine()
+        res = ocr.ocr(img)
     except Exception as e:
         print("ERR:", type(e).__name__, e)
         return 1
@@ -10,6 +10,7 @@ def main() -> int:
         sys.path.insert(0, str(root))
 
     try:
+        from app.services.image_types import PreprocessedImage
         from app.services.ocr_engine import PaddleOcrEngine
         from app.core.config import get_settings
         import numpy as np
@@ -23,7 +24,7 @@ def main() -> int:
 
     img = (np.ones((10, 10, 3), dtype="uint8") * 255)
     try:
-        out = engine.recognize_text(img)
+        out = engine.recognize_text(PreprocessedImage.from_array(img))
         print("OK: OCR ran; length:", len(out))
         return 0
     except Exception as e: